@@ -1,10 +1,19 @@
+import functools
 import html as html_module
 import re
+import string
 from decimal import Decimal, InvalidOperation
 
 from pipeline.schemas import ClinicalClaim, ComplianceFlag, ComplianceReport, ExtractionResult
 
+_PCT_RE = re.compile(r"(\d+\.?\d*)\s*%")
+_NUM_OPT_PCT_RE = re.compile(r"\b(\d+\.?\d*)\s*%?")
+_LAYOUT_PERCENTAGES = frozenset({Decimal("0"), Decimal("100")})
+_BLOCK_TAGS = ("style", "script")
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
 
+
+@functools.lru_cache(maxsize=1024)
 def _normalize_number(s: str) -> Decimal | None:
     stripped = s.strip().replace("%", "").strip()
     try:
@@ -13,21 +22,70 @@ def _normalize_number(s: str) -> Decimal | None:
         return None
 
 
-def _strip_tags(text: str, tags: list[str]) -> str:
-    for tag in tags:
-        text = re.sub(rf"<{tag}[^>]*>.*?</{tag}>", "", text, flags=re.DOTALL | re.IGNORECASE)
-    return text
-
-
+def _strip_style_script(html_content: str) -> str:
+    """Remove <style> and <script> blocks, each ending at its first closing tag.
+
+    Every str.find result is kept while it still lies ahead of the scan, so
+    each stretch of the document is searched once per needle and a run of
+    unterminated openers stays linear.
+    """
+    # Shares the memoised lowercase copy with the field checks.
+    lower = _lowercase(html_content)
+    if len(lower) != len(html_content):
+        # A few characters (e.g. "\u0130") lowercase to two; keep offsets aligned.
+        lower = html_content.translate(_ASCII_LOWER)
+
+    parts = []
+    kept_from = scan = 0
+    next_gt = -1
+    # -1 means the needle does not occur again, so it is never searched for twice.
+    next_open = {tag: lower.find(f"<{tag}") for tag in _BLOCK_TAGS}
+    next_close: dict[str, int] = {}
+    while True:
+        for tag, pos in next_open.items():
+            if 0 <= pos < scan:
+                next_open[tag] = lower.find(f"<{tag}", scan)
+        found = [(pos, tag) for tag, pos in next_open.items() if pos != -1]
+        if not found:
+            break
+        start, tag = min(found)
+        name_end = start + 1 + len(tag)
+        # The tag name must end at a word boundary: <scripts> is not a block.
+        if name_end < len(lower) and (lower[name_end].isalnum() or lower[name_end] == "_"):
+            scan = start + 1
+            continue
+        if next_gt < name_end:
+            next_gt = lower.find(">", name_end)
+            if next_gt == -1:
+                break
+        close = next_close.get(tag, 0)
+        if close != -1 and close <= next_gt:
+            close = next_close[tag] = lower.find(f"</{tag}>", next_gt + 1)
+        if close == -1:
+            scan = start + 1
+            continue
+        parts.append(html_content[kept_from:start])
+        kept_from = scan = close + len(tag) + 3
+    parts.append(html_content[kept_from:])
+    return "".join(parts)
+
+
+@functools.lru_cache(maxsize=8)
 def _visible_text(html_content: str) -> str:
-    return _strip_tags(html_content, ["style", "script"])
+    # check_numbers and check_unexpected_numbers both need the stripped text.
+    return _strip_style_script(html_content)
 
 
 def _extract_percentages(text: str) -> set[Decimal]:
     cleaned = _visible_text(text)
-    matches = re.findall(r"(\d+\.?\d*)\s*%", cleaned)
     # 0% and 100% are layout/CSS values, not clinical data
-    return {Decimal(m) for m in matches if Decimal(m) not in (Decimal("0"), Decimal("100"))}
+    return {Decimal(m) for m in _PCT_RE.findall(cleaned)} - _LAYOUT_PERCENTAGES
+
+
+@functools.lru_cache(maxsize=8)
+def _lowercase(html_content: str) -> str:
+    # The three field checks of one variant lowercase the same document.
+    return html_content.lower()
 
 
 def _check_field_present(
@@ -37,48 +95,55 @@ def _check_field_present(
     flag_type: str,
     severity: str,
 ) -> list[ComplianceFlag]:
-    seen: set[str] = set()
-    flags = []
+    values: dict[str, str] = {}
     for claim in claims:
         value = getattr(claim, field)
-        values = value if isinstance(value, list) else [value]
-        for v in values:
-            if v in seen:
-                continue
-            seen.add(v)
-            if v.lower() not in html_content.lower():
-                flags.append(ComplianceFlag(
-                    flag_type=flag_type,
-                    severity=severity,
-                    location=v,
-                    description=f"{field.capitalize()} not found in HTML: {v}",
-                ))
-    return flags
+        for v in value if isinstance(value, list) else [value]:
+            if v not in values:
+                values[v] = v.lower()
+
+    # Values that differ only in case share one scan of the document.
+    html_lower = _lowercase(html_content)
+    missing = {needle for needle in set(values.values()) if needle not in html_lower}
+    return [
+        ComplianceFlag(
+            flag_type=flag_type,
+            severity=severity,
+            location=v,
+            description=f"{field.capitalize()} not found in HTML: {v}",
+        )
+        for v, needle in values.items() if needle in missing
+    ]
 
 
 def check_numbers(html_content: str, claims: list[ClinicalClaim]) -> list[ComplianceFlag]:
     visible = _visible_text(html_content)
+    # Built on the first substring miss only; rendered variants normally
+    # contain every statistic verbatim, so the regex pass is usually skipped.
+    visible_numbers: set[Decimal] | None = None
     flags = []
     for claim in claims:
         stat = claim.statistic
-        norm = _normalize_number(stat)
         raw_num = stat.replace("%", "").strip()
+        if raw_num in visible or stat in visible:
+            continue
 
-        found = raw_num in visible or stat in visible
-
-        if not found and norm is not None:
-            for match in re.findall(r"\b(\d+\.?\d*)\s*%?", visible):
-                if _normalize_number(match) == norm:
-                    found = True
-                    break
+        norm = _normalize_number(stat)
+        if norm is not None:
+            if visible_numbers is None:
+                visible_numbers = {
+                    n for m in _NUM_OPT_PCT_RE.findall(visible)
+                    if (n := _normalize_number(m)) is not None
+                }
+            if norm in visible_numbers:
+                continue
 
-        if not found:
-            flags.append(ComplianceFlag(
-                flag_type="number_missing",
-                severity="error",
-                location=stat,
-                description=f"Source statistic {stat} not found in HTML",
-            ))
+        flags.append(ComplianceFlag(
+            flag_type="number_missing",
+            severity="error",
+            location=stat,
+            description=f"Source statistic {stat} not found in HTML",
+        ))
     return flags
 
 
@@ -1,10 +1,19 @@
 """Extraction module — Stage 1 of the content variance pipeline."""
 
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_openai import ChatOpenAI
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+import orjson
+from pydantic import ValidationError
 
 from pipeline.schemas import ExtractionResult
 
+logger = logging.getLogger(__name__)
+
 EXTRACTION_SYSTEM_PROMPT = (
     "You are a clinical data extraction specialist. "
     "Extract ALL clinical claims from the provided pharmaceutical source text. "
@@ -23,23 +32,100 @@ EXTRACTION_SYSTEM_PROMPT = (
     "Preserve exact numbers and wording from the source text."
 )
 
-_prompt = ChatPromptTemplate.from_messages([
-    ("system", EXTRACTION_SYSTEM_PROMPT),
-    ("human", "{source_text}"),
-])
+EXTRACTION_MODEL = "gpt-5-nano"
+
+# Routes requests to servers holding the cached system-prompt prefix. The
+# static prompt must stay first and the source text last for caching to apply;
+# bump the suffix whenever EXTRACTION_SYSTEM_PROMPT changes. The local disk
+# cache does not depend on it: _cache_path hashes the prompt itself.
+PROMPT_CACHE_KEY = "extract-claims-v1"
+
+# Upper bound on completion tokens, reasoning included. A 60-claim document
+# needs ~5k tokens of JSON; the headroom covers gpt-5-nano's reasoning while
+# still cutting off a runaway response.
+EXTRACTION_MAX_TOKENS = 16384
 
 _extraction_chain = None
+_chain_lock = threading.Lock()
 
 
 def _get_chain():
     global _extraction_chain
-    if _extraction_chain is None:
-        _llm = ChatOpenAI(model="gpt-5-nano")
-        _extraction_chain = _prompt | _llm.with_structured_output(ExtractionResult)
+    if _extraction_chain is not None:
+        return _extraction_chain
+    with _chain_lock:
+        if _extraction_chain is None:
+            # Imported here: langchain_openai takes ~0.9 s to import, and cached
+            # extractions never need it.
+            from langchain_core.prompts import ChatPromptTemplate
+            from langchain_openai import ChatOpenAI
+
+            prompt = ChatPromptTemplate.from_messages([
+                ("system", EXTRACTION_SYSTEM_PROMPT),
+                ("human", "{source_text}"),
+            ])
+            _llm = ChatOpenAI(
+                model=EXTRACTION_MODEL,
+                max_tokens=EXTRACTION_MAX_TOKENS,
+                model_kwargs={"prompt_cache_key": PROMPT_CACHE_KEY},
+            )
+            _extraction_chain = prompt | _llm.with_structured_output(ExtractionResult)
     return _extraction_chain
 
 
+def _cache_path(source_text: str) -> Path | None:
+    cache_dir = os.environ.get("EXTRACTION_CACHE_DIR")
+    if not cache_dir:
+        return None
+    # Hash everything that shapes the model's output, so editing the prompt or
+    # the schema field descriptions invalidates old entries automatically.
+    digest = hashlib.blake2b(digest_size=32)
+    for part in (
+        EXTRACTION_MODEL.encode("utf-8"),
+        EXTRACTION_SYSTEM_PROMPT.encode("utf-8"),
+        orjson.dumps(ExtractionResult.model_json_schema(), option=orjson.OPT_SORT_KEYS),
+        source_text.encode("utf-8"),
+    ):
+        digest.update(part)
+        digest.update(b"\0")
+    return Path(cache_dir) / f"{digest.hexdigest()}.json"
+
+
+def _read_cache(cache_path: Path) -> ExtractionResult | None:
+    # The cache is best-effort: a missing, unreadable, truncated or outdated
+    # entry is a miss and gets overwritten after the LLM call.
+    try:
+        return ExtractionResult.model_validate_json(cache_path.read_bytes())
+    except (OSError, ValidationError):
+        return None
+
+
+def _write_cache(cache_path: Path, result: ExtractionResult) -> None:
+    tmp_name = None
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=cache_path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(result.model_dump_json().encode("utf-8"))
+        os.replace(tmp_name, cache_path)
+    except OSError as exc:
+        # Never lose a paid extraction because the cache is not writable.
+        if tmp_name is not None:
+            Path(tmp_name).unlink(missing_ok=True)
+        logger.warning("Could not write extraction cache %s: %s", cache_path, exc)
+
+
 def extract_claims(source_text: str) -> ExtractionResult:
-    return _get_chain().invoke({
+    cache_path = _cache_path(source_text)
+    if cache_path is not None:
+        cached = _read_cache(cache_path)
+        if cached is not None:
+            return cached
+
+    result = _get_chain().invoke({
         "source_text": source_text,
     })
+
+    if cache_path is not None:
+        _write_cache(cache_path, result)
+    return result
@@ -1,16 +1,26 @@
 """Ingest module — extracts text from a PDF for a given page range."""
 
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 from pypdf import PdfReader
 
 
-def extract_pdf_text(pdf_path: Path, pages: list[int] | None = None) -> str:
+def _extract_pages(pdf_path: str, indices: list[int]) -> list[str]:
+    # Runs in a worker process: PdfReader is neither picklable nor thread-safe,
+    # so each worker opens its own.
+    reader = PdfReader(pdf_path)
+    return [reader.pages[i].extract_text() or "" for i in indices]
+
+
+def extract_pdf_text(pdf_path: Path, pages: list[int] | None = None, workers: int = 1) -> str:
     """Return the combined text from a PDF file.
 
     Args:
         pdf_path: Path to the PDF file.
         pages: 1-based page numbers to extract. If None, all pages are extracted.
+        workers: Number of processes to spread page extraction across. Pages are
+            split into contiguous chunks, one per worker.
 
     Returns:
         Concatenated text from the requested pages, separated by newlines.
@@ -19,7 +29,7 @@ def extract_pdf_text(pdf_path: Path, pages: list[int] | None = None) -> str:
     total = len(reader.pages)
 
     if pages is None:
-        indices = range(total)
+        indices = list(range(total))
     else:
         indices = [p - 1 for p in pages]
         out_of_range = [p for p, i in zip(pages, indices) if i < 0 or i >= total]
@@ -28,5 +38,14 @@ def extract_pdf_text(pdf_path: Path, pages: list[int] | None = None) -> str:
                 f"Page(s) {out_of_range} out of range for PDF with {total} pages"
             )
 
-    parts = [reader.pages[i].extract_text() or "" for i in indices]
+    workers = min(workers, len(indices))
+    if workers <= 1:
+        parts = [reader.pages[i].extract_text() or "" for i in indices]
+    else:
+        chunk_size = -(-len(indices) // workers)
+        chunks = [indices[k:k + chunk_size] for k in range(0, len(indices), chunk_size)]
+        with ProcessPoolExecutor(max_workers=len(chunks)) as executor:
+            results = executor.map(_extract_pages, [str(pdf_path)] * len(chunks), chunks)
+            parts = [text for chunk_texts in results for text in chunk_texts]
+
     return "\n\n".join(parts).strip()
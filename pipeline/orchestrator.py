@@ -1,12 +1,13 @@
 """Orchestrator — wires extract -> generate -> validate and persists outputs."""
 
-import json
 import logging
 from pathlib import Path
 
+import orjson
+
 from pipeline.extract import extract_claims
 from pipeline.generate import generate_all_variants, VARIANT_TYPES
-from pipeline.schemas import VariantResult
+from pipeline.schemas import ExtractionResult, VariantResult
 from pipeline.validate import validate_variant
 
 logger = logging.getLogger(__name__)
@@ -30,58 +31,41 @@ _VARIANT_ICONS: dict[str, str] = {
 
 _ACCENT_COLORS = ["#0d9488", "#a855f7", "#e879a0", "#2d4a7a", "#c026d3"]
 
+_COMPLIANCE_METHODOLOGY = {
+    "programmatic_checks": (
+        "Numbers, citations, qualifiers, and endpoints verified "
+        "against source claims via automated text matching."
+    ),
+    "semantic_risk_mitigation": (
+        "Semantic risks (claim expansion, tone shift, superiority implications) "
+        "are structurally mitigated by template rendering — no generative prose "
+        "means no drift surface."
+    ),
+}
 
-def _generate_index_html(
-    results: list[tuple[int, VariantResult]],
-    failed_indices: list[int],
-) -> str:
-    results_by_index = dict(results)
-    all_indices = sorted({i for i, _ in results} | set(failed_indices))
-
-    cards = []
-    for i in all_indices:
-        vt = VARIANT_TYPES[i]
-        label, description = _VARIANT_LABELS.get(vt, (vt.replace("_", " ").title(), ""))
-        icon_svg = _VARIANT_ICONS.get(vt, "")
-        accent = _ACCENT_COLORS[i % len(_ACCENT_COLORS)]
-
-        if i in failed_indices:
-            status_badge = '<span class="badge badge-failed">Failed</span>'
-            link_attr = ""
-            card_class = "variant-card variant-card--disabled"
-        else:
-            result = results_by_index[i]
-            if result.overall_passed:
-                status_badge = '<span class="badge badge-passed">Passed</span>'
-            else:
-                status_badge = '<span class="badge badge-failed">Failed</span>'
-            link_attr = f' onclick="window.location.href=\'variant_{i}.html\'" style="cursor:pointer"'
-            card_class = "variant-card"
-
-        cards.append(
-            f'<div class="{card_class}"{link_attr}>'
-            f'<div class="card-accent" style="background:{accent}"></div>'
-            f'<div class="card-body">'
-            f'<div class="card-header">'
-            f'<div class="card-icon" style="color:{accent}">{icon_svg}</div>'
-            f'<div class="card-meta"><span class="card-number">Variant {i}</span>{status_badge}</div>'
-            f'</div>'
-            f'<h2 class="card-title">{label}</h2>'
-            f'<p class="card-description">{description}</p>'
-            f'<div class="card-footer">'
-            f'<span class="card-type">{vt}</span>'
-            f'{"<span class=&quot;card-link&quot;>View &rarr;</span>" if i not in failed_indices else ""}'
-            f'</div>'
-            f'</div>'
-            f'</div>'
-        )
-
-    total = len(all_indices)
-    passed = sum(1 for i in all_indices if i not in failed_indices and results_by_index.get(i, None) and results_by_index[i].overall_passed)
-    failed = len(failed_indices)
-
-    cards_html = "\n".join(cards)
-    return f"""<!DOCTYPE html>
+_BADGE_PASSED = '<span class="badge badge-passed">Passed</span>'
+_BADGE_FAILED = '<span class="badge badge-failed">Failed</span>'
+_CARD_LINK = "<span class=&quot;card-link&quot;>View &rarr;</span>"
+
+_CARD_TEMPLATE = (
+    '<div class="{card_class}"{link_attr}>'
+    '<div class="card-accent" style="background:{accent}"></div>'
+    '<div class="card-body">'
+    '<div class="card-header">'
+    '<div class="card-icon" style="color:{accent}">{icon_svg}</div>'
+    '<div class="card-meta"><span class="card-number">Variant {index}</span>{status_badge}</div>'
+    '</div>'
+    '<h2 class="card-title">{label}</h2>'
+    '<p class="card-description">{description}</p>'
+    '<div class="card-footer">'
+    '<span class="card-type">{variant_type}</span>'
+    '{card_link}'
+    '</div>'
+    '</div>'
+    '</div>'
+)
+
+_INDEX_TEMPLATE = """<!DOCTYPE html>
 <html lang="en">
 <head>
   <meta charset="utf-8">
@@ -320,6 +304,57 @@ def _generate_index_html(
 </html>"""
 
 
+def _generate_index_html(
+    results: list[tuple[int, VariantResult]],
+    failed_indices: list[int],
+) -> str:
+    results_by_index = dict(results)
+    all_indices = sorted({i for i, _ in results} | set(failed_indices))
+
+    cards = []
+    for i in all_indices:
+        vt = VARIANT_TYPES[i]
+        label, description = _VARIANT_LABELS.get(vt, (vt.replace("_", " ").title(), ""))
+        accent = _ACCENT_COLORS[i % len(_ACCENT_COLORS)]
+        card = {
+            "index": i,
+            "variant_type": vt,
+            "label": label,
+            "description": description,
+            "icon_svg": _VARIANT_ICONS.get(vt, ""),
+            "accent": accent,
+        }
+
+        if i in failed_indices:
+            card.update(
+                card_class="variant-card variant-card--disabled",
+                link_attr="",
+                status_badge=_BADGE_FAILED,
+                card_link="",
+            )
+        else:
+            card.update(
+                card_class="variant-card",
+                link_attr=f' onclick="window.location.href=\'variant_{i}.html\'" style="cursor:pointer"',
+                status_badge=_BADGE_PASSED if results_by_index[i].overall_passed else _BADGE_FAILED,
+                card_link=_CARD_LINK,
+            )
+
+        cards.append(_CARD_TEMPLATE.format_map(card))
+
+    total = len(all_indices)
+    passed = sum(1 for i in all_indices if i not in failed_indices and results_by_index.get(i, None) and results_by_index[i].overall_passed)
+    failed = len(failed_indices)
+
+    cards_html = "\n".join(cards)
+    return _INDEX_TEMPLATE.format_map({
+        "total": total,
+        "passed": passed,
+        "failed": failed,
+        "cards_html": cards_html,
+    })
+
+
 def run_pipeline(page_content: str, output_dir: Path) -> list[VariantResult]:
     extraction = extract_claims(page_content)
 
@@ -340,32 +375,24 @@ def run_pipeline(page_content: str, output_dir: Path) -> list[VariantResult]:
             continue
         try:
             result = validate_variant(vt, item, extraction)
-            successful.append((i, result))
             (output_dir / f"variant_{i}.html").write_text(item, encoding="utf-8")
+            # Recorded only once the HTML is on disk, so a failed write cannot
+            # leave the variant in both successful and failed_indices.
+            successful.append((i, result))
         except Exception as exc:
-            logger.warning("Variant %d (%s) failed validation: %s", i, vt, exc)
+            logger.warning("Variant %d (%s) failed validation or write: %s", i, vt, exc)
             failed_indices.append(i)
 
-    (output_dir / "claims.json").write_text(
-        json.dumps(extraction.model_dump(), indent=2), encoding="utf-8"
+    (output_dir / "claims.json").write_bytes(
+        orjson.dumps(extraction.model_dump(), option=orjson.OPT_INDENT_2)
     )
 
     compliance_report = {
-        "compliance_methodology": {
-            "programmatic_checks": (
-                "Numbers, citations, qualifiers, and endpoints verified "
-                "against source claims via automated text matching."
-            ),
-            "semantic_risk_mitigation": (
-                "Semantic risks (claim expansion, tone shift, superiority implications) "
-                "are structurally mitigated by template rendering — no generative prose "
-                "means no drift surface."
-            ),
-        },
+        "compliance_methodology": _COMPLIANCE_METHODOLOGY,
         "results": [r.model_dump(exclude={"html"}) for _, r in successful],
     }
-    (output_dir / "compliance_report.json").write_text(
-        json.dumps(compliance_report, indent=2), encoding="utf-8"
+    (output_dir / "compliance_report.json").write_bytes(
+        orjson.dumps(compliance_report, option=orjson.OPT_INDENT_2)
     )
 
     (output_dir / "index.html").write_text(
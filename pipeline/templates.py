@@ -1,9 +1,12 @@
 """Template rendering infrastructure for HTML variant generation."""
 
-import json
+import functools
 import re
 from collections.abc import Callable
 from html import escape as _esc
+from operator import attrgetter
+
+import orjson
 
 from pipeline.schemas import ClinicalClaim
 
@@ -19,6 +22,14 @@ COLORS_LIGHT = [
 
 ARM_BORDER_COLORS = ["#0d9488", "#2d4a7a", "#c026d3", "#7c3aed", "#e879a0", "#F39C12"]
 
+_TIMEPOINT_RE = re.compile(r"(?:Week|Month|Day|Year)\s+([\d.]+)", re.IGNORECASE)
+# Keyed on the first letter: the regex only matches these four unit words.
+_TIMEPOINT_UNIT_ORDER = {"d": 0, "w": 1, "m": 2, "y": 3}
+
+
+def _to_json(obj: object) -> str:
+    return orjson.dumps(obj).decode("utf-8")
+
 
 def _extract_drug_name(claims: list[ClinicalClaim]) -> str:
     if not claims:
@@ -32,6 +43,7 @@ def _unique_values(claims: list[ClinicalClaim], field: str) -> list[str]:
     return list(dict.fromkeys(getattr(c, field) for c in claims))
 
 
+@functools.lru_cache(maxsize=1024)
 def _parse_stat(stat: str) -> float | None:
     cleaned = stat.strip().rstrip("%")
     try:
@@ -40,37 +52,47 @@ def _parse_stat(stat: str) -> float | None:
         return None
 
 
+def _parse_all(claims: list[ClinicalClaim]) -> list[float | None]:
+    return [_parse_stat(c.statistic) for c in claims]
+
+
 def _collect_qualifiers(claims: list[ClinicalClaim]) -> list[str]:
     return list(dict.fromkeys(q for c in claims for q in c.qualifiers))
 
 
+@functools.lru_cache(maxsize=256)
 def _sort_timepoint_key(tp: str) -> tuple[int, float]:
-    m = re.match(r"(?:Week|Month|Day|Year)\s+([\d.]+)", tp, re.IGNORECASE)
+    m = _TIMEPOINT_RE.match(tp)
     if not m:
         return (1, 0.0)
     val = float(m.group(1))
-    word = tp.split()[0].lower()
-    order = {"day": 0, "week": 1, "month": 2, "year": 3}
-    return (0, order.get(word, 1) * 1000 + val)
+    return (0, _TIMEPOINT_UNIT_ORDER[tp[0].lower()] * 1000 + val)
+
+
+def _index_by(claims: list[ClinicalClaim], field: str) -> dict[str, list[ClinicalClaim]]:
+    index: dict[str, list[ClinicalClaim]] = {}
+    for c in claims:
+        index.setdefault(getattr(c, field), []).append(c)
+    return index
 
 
 def _group_by_keys(claims: list[ClinicalClaim], field1: str, field2: str) -> dict[tuple[str, str], list[ClinicalClaim]]:
+    key = attrgetter(field1, field2)
     groups: dict[tuple[str, str], list[ClinicalClaim]] = {}
     for c in claims:
-        key = (getattr(c, field1), getattr(c, field2))
-        groups.setdefault(key, []).append(c)
+        groups.setdefault(key(c), []).append(c)
     return groups
 
 
-def _build_chart_script(canvas_id: str, chart_type: str, labels_json: str, datasets_json: str, title: str | None = None) -> str:
-    title_opt = f"title: {{ display: true, text: {json.dumps(title)}, font: {{ size: 14, family: 'Inter', weight: '600' }}, color: '#1a2b4a' }}" if title else ""
-    legend_opt = "legend: { labels: { font: { size: 11, family: 'Inter' }, usePointStyle: true, pointStyle: 'circle' } }"
-    plugins = f"plugins: {{ {title_opt}{', ' if title_opt else ''}{legend_opt} }}"
+_CHART_LEGEND_OPT = "legend: { labels: { font: { size: 11, family: 'Inter' }, usePointStyle: true, pointStyle: 'circle' } }"
+_CHART_SCALES_BAR = "scales: { y: { grid: { color: 'rgba(148,163,184,0.15)' }, ticks: { font: { size: 11, family: 'Inter' } } }, x: { grid: { display: false }, ticks: { font: { size: 11, family: 'Inter' } } } }"
+_CHART_SCALES_LINE = "scales: { y: { grid: { color: 'rgba(148,163,184,0.15)' }, ticks: { font: { size: 11, family: 'Inter' } } }, x: { grid: { color: 'rgba(148,163,184,0.08)' }, ticks: { font: { size: 11, family: 'Inter' } } } }"
 
-    if chart_type == "bar":
-        scales = "scales: { y: { grid: { color: 'rgba(148,163,184,0.15)' }, ticks: { font: { size: 11, family: 'Inter' } } }, x: { grid: { display: false }, ticks: { font: { size: 11, family: 'Inter' } } } }"
-    else:
-        scales = "scales: { y: { grid: { color: 'rgba(148,163,184,0.15)' }, ticks: { font: { size: 11, family: 'Inter' } } }, x: { grid: { color: 'rgba(148,163,184,0.08)' }, ticks: { font: { size: 11, family: 'Inter' } } } }"
+
+def _build_chart_script(canvas_id: str, chart_type: str, labels_json: str, datasets_json: str, title: str | None = None) -> str:
+    title_opt = f"title: {{ display: true, text: {_to_json(title)}, font: {{ size: 14, family: 'Inter', weight: '600' }}, color: '#1a2b4a' }}" if title else ""
+    plugins = f"plugins: {{ {title_opt}{', ' if title_opt else ''}{_CHART_LEGEND_OPT} }}"
+    scales = _CHART_SCALES_BAR if chart_type == "bar" else _CHART_SCALES_LINE
 
     return f"""
 new Chart(document.getElementById('{canvas_id}'), {{
@@ -81,12 +103,11 @@ new Chart(document.getElementById('{canvas_id}'), {{
 
 
 def _build_data_table(claims: list[ClinicalClaim]) -> str:
-    rows = ""
-    for c in claims:
-        rows += (
-            f"<tr><td>{_esc(c.treatment_arm)}</td><td>{_esc(c.statistic)}</td>"
-            f"<td>{_esc(c.context)}</td><td>{_esc(c.sample_size)}</td></tr>\n"
-        )
+    rows = "".join(
+        f"<tr><td>{_esc(c.treatment_arm)}</td><td>{_esc(c.statistic)}</td>"
+        f"<td>{_esc(c.context)}</td><td>{_esc(c.sample_size)}</td></tr>\n"
+        for c in claims
+    )
     return (
         '<table><thead><tr><th>Treatment Arm</th><th>Statistic</th>'
         '<th>Context</th><th>Sample Size</th></tr></thead>'
@@ -122,8 +143,7 @@ def render_grouped_bar(claims: list[ClinicalClaim]) -> str:
 
     for (timepoint, endpoint), group in groups.items():
         arms = _unique_values(group, "treatment_arm")
-        values = [_parse_stat(c.statistic) for c in group]
-        colors = [COLORS[i % len(COLORS)] for i, _ in enumerate(arms)]
+        values = _parse_all(group)
 
         canvas_id = f"chart-{chart_idx}"
         body_parts.append(
@@ -132,17 +152,17 @@ def render_grouped_bar(claims: list[ClinicalClaim]) -> str:
             f'{_build_data_table(group)}</div>'
         )
 
-        datasets_json = json.dumps([{
+        datasets_json = _to_json([{
             "label": arm,
             "data": [val if val is not None else 0],
-            "backgroundColor": color,
+            "backgroundColor": COLORS[i % len(COLORS)],
             "borderRadius": 6,
             "borderSkipped": False,
-        } for arm, val, color in zip(arms, values, colors)])
+        } for i, (arm, val) in enumerate(zip(arms, values))])
 
         title_text = f"{endpoint} — {timepoint}"
         script_parts.append(_build_chart_script(
-            canvas_id, "bar", json.dumps([endpoint]), datasets_json, title_text
+            canvas_id, "bar", _to_json([endpoint]), datasets_json, title_text
         ))
         chart_idx += 1
 
@@ -169,16 +189,19 @@ def render_timeline(claims: list[ClinicalClaim]) -> str:
     body_parts = []
     script_parts = []
 
-    endpoints = _unique_values(claims, "endpoint")
+    groups_by_ep: dict[str, dict[tuple[str, str], list[ClinicalClaim]]] = {}
+    for key, group in groups.items():
+        groups_by_ep.setdefault(key[1], {})[key] = group
+
     chart_idx = 0
-    for ep in endpoints:
-        ep_groups = {k: v for k, v in groups.items() if k[1] == ep}
+    for ep, ep_claims in _index_by(claims, "endpoint").items():
+        ep_groups = groups_by_ep[ep]
         canvas_id = f"chart-{chart_idx}"
 
         datasets = []
         for i, ((arm, _), group) in enumerate(ep_groups.items()):
             tp_map = {c.timepoint: _parse_stat(c.statistic) for c in group}
-            data = [tp_map.get(tp, 0) if tp_map.get(tp) is not None else 0 for tp in sorted_tps]
+            data = [0 if v is None else v for v in map(tp_map.get, sorted_tps)]
             datasets.append({
                 "label": arm,
                 "data": data,
@@ -190,15 +213,14 @@ def render_timeline(claims: list[ClinicalClaim]) -> str:
                 "pointHoverRadius": 7,
             })
 
-        ep_claims = [c for c in claims if c.endpoint == ep]
         body_parts.append(
             f'<div class="card"><h2>{_esc(ep)}</h2>'
             f'<canvas id="{canvas_id}"></canvas>'
             f'{_build_data_table(ep_claims)}</div>'
         )
 
-        labels_json = json.dumps(sorted_tps)
-        datasets_json = json.dumps(datasets)
+        labels_json = _to_json(sorted_tps)
+        datasets_json = _to_json(datasets)
         script_parts.append(_build_chart_script(
             canvas_id, "line", labels_json, datasets_json, ep
         ))
@@ -215,17 +237,16 @@ def render_timeline(claims: list[ClinicalClaim]) -> str:
 def _render_timeline_as_bar(claims: list[ClinicalClaim]) -> str:
     drug_name = _extract_drug_name(claims)
     arms = _unique_values(claims, "treatment_arm")
-    values = [_parse_stat(c.statistic) for c in claims]
-    colors = [COLORS[i % len(COLORS)] for i, _ in enumerate(arms)]
+    values = _parse_all(claims)
     endpoint = claims[0].endpoint if claims else "Data"
 
-    datasets_json = json.dumps([{
+    datasets_json = _to_json([{
         "label": arm,
         "data": [val if val is not None else 0],
-        "backgroundColor": color,
+        "backgroundColor": COLORS[i % len(COLORS)],
         "borderRadius": 6,
         "borderSkipped": False,
-    } for arm, val, color in zip(arms, values, colors)])
+    } for i, (arm, val) in enumerate(zip(arms, values))])
 
     body = (
         f'<div class="card"><h2>{_esc(endpoint)}</h2>'
@@ -234,7 +255,7 @@ def _render_timeline_as_bar(claims: list[ClinicalClaim]) -> str:
         f'{_build_footer(claims)}'
     )
     script = "<script>" + _build_chart_script(
-        "chart-0", "bar", json.dumps([endpoint]), datasets_json
+        "chart-0", "bar", _to_json([endpoint]), datasets_json
     ) + "\n</script>"
     title = f"{drug_name} Response Over Time"
     return _html_skeleton(title, body, script, drug_name=drug_name, variant_label="Response Over Time")
@@ -242,10 +263,8 @@ def _render_timeline_as_bar(claims: list[ClinicalClaim]) -> str:
 
 def render_spotlight_cards(claims: list[ClinicalClaim]) -> str:
     drug_name = _extract_drug_name(claims)
-    contexts = _unique_values(claims, "context")
     cards = []
-    for idx, ctx in enumerate(contexts):
-        ctx_claims = [c for c in claims if c.context == ctx]
+    for idx, (ctx, ctx_claims) in enumerate(_index_by(claims, "context").items()):
         hero_claim = ctx_claims[0]
         border_color = ARM_BORDER_COLORS[idx % len(ARM_BORDER_COLORS)]
         stat_items = "".join(
@@ -340,13 +359,12 @@ def render_heatmap(claims: list[ClinicalClaim]) -> str:
     drug_name = _extract_drug_name(claims)
     groups = _group_by_keys(claims, "timepoint", "endpoint")
 
-    all_vals = [_parse_stat(c.statistic) for c in claims if _parse_stat(c.statistic) is not None]
+    all_vals = [v for v in _parse_all(claims) if v is not None]
     min_val = min(all_vals) if all_vals else 0
     max_val = max(all_vals) if all_vals else 1
     val_range = max_val - min_val if max_val != min_val else 1
 
-    def _cell_color(stat_str: str) -> str:
-        v = _parse_stat(stat_str)
+    def _cell_color(v: float | None) -> str:
         if v is None:
             return "#FFFFFF"
         t = (v - min_val) / val_range
@@ -355,8 +373,7 @@ def render_heatmap(claims: list[ClinicalClaim]) -> str:
         b = int(254 + (74 - 254) * t)
         return f"rgb({r},{g},{b})"
 
-    def _cell_text_color(stat_str: str) -> str:
-        v = _parse_stat(stat_str)
+    def _cell_text_color(v: float | None) -> str:
         if v is None:
             return "#1e293b"
         t = (v - min_val) / val_range
@@ -372,11 +389,11 @@ def render_heatmap(claims: list[ClinicalClaim]) -> str:
 
     tables = []
     for (timepoint, endpoint), group in groups.items():
-        rows = ""
-        for c in group:
-            bg = _cell_color(c.statistic)
-            fg = _cell_text_color(c.statistic)
-            rows += (
+        rows = []
+        for c, v in zip(group, _parse_all(group)):
+            bg = _cell_color(v)
+            fg = _cell_text_color(v)
+            rows.append(
                 f'<tr>'
                 f'<td>{_esc(c.treatment_arm)}</td>'
                 f'<td style="background-color: {bg}; color: {fg}; font-weight: 600; text-align: center; border-radius: 6px;">{_esc(c.statistic)}</td>'
@@ -388,7 +405,7 @@ def render_heatmap(claims: list[ClinicalClaim]) -> str:
             f'<div class="card"><h2>{_esc(endpoint)} — {_esc(timepoint)}</h2>'
             f'<table><thead><tr>'
             f'<th>Treatment Arm</th><th>Statistic</th><th>Context</th><th>Sample Size</th>'
-            f'</tr></thead><tbody>{rows}</tbody></table></div>'
+            f'</tr></thead><tbody>{"".join(rows)}</tbody></table></div>'
         )
 
     extra_css = """
@@ -450,18 +467,18 @@ def render_infographic(claims: list[ClinicalClaim]) -> str:
         for i, c in enumerate(claims)
     )
 
-    values = [_parse_stat(c.statistic) for c in claims]
+    values = _parse_all(claims)
     colors = [COLORS[i % len(COLORS)] for i, _ in enumerate(claims)]
     labels = [c.treatment_arm for c in claims]
 
-    datasets_json = json.dumps([{
+    datasets_json = _to_json([{
         "label": "Value",
         "data": [v if v is not None else 0 for v in values],
         "backgroundColor": colors,
         "borderRadius": 6,
         "borderSkipped": False,
     }])
-    labels_json = json.dumps(labels)
+    labels_json = _to_json(labels)
 
     extra_css = """
         .hero {
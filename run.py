@@ -6,9 +6,6 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
-from pipeline.ingest import extract_pdf_text
-from pipeline.orchestrator import run_pipeline
-
 
 def _parse_pages(pages_str: str) -> list[int]:
     """Parse a comma-separated and/or range page spec like '3-6,9,11' into a list of ints."""
@@ -48,6 +45,15 @@ def main() -> None:
             "1-based. Ignored for .txt inputs."
         ),
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help=(
+            "Processes to spread PDF page extraction across (default: 1). "
+            "Each worker re-opens the PDF. Ignored for .txt inputs."
+        ),
+    )
     args = parser.parse_args()
 
     if not args.input.exists():
@@ -57,12 +63,14 @@ def main() -> None:
     suffix = args.input.suffix.lower()
 
     if suffix == ".pdf":
+        from pipeline.ingest import extract_pdf_text
+
         pages = _parse_pages(args.pages) if args.pages else None
         print(
             f"Extracting text from {args.input}"
             + (f" (pages {args.pages})" if pages else " (all pages)")
         )
-        page_content = extract_pdf_text(args.input, pages=pages)
+        page_content = extract_pdf_text(args.input, pages=pages, workers=args.workers)
     elif suffix == ".txt":
         if args.pages:
             print("Warning: --pages is ignored for .txt inputs.")
@@ -71,6 +79,9 @@ def main() -> None:
         print(f"Error: unsupported file type '{suffix}'. Provide a .pdf or .txt file.")
         sys.exit(1)
 
+    # Deferred so usage errors and bad paths exit before pydantic loads.
+    from pipeline.orchestrator import run_pipeline
+
     results = run_pipeline(page_content, args.output_dir)
     print(f"Pipeline complete. {len(results)} variants generated. Output: {args.output_dir}")
 
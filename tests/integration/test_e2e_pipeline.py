@@ -14,6 +14,9 @@ from tests.integration.test_extract_integration import (
 
 load_dotenv()
 
+_SCRIPT_RE = re.compile(r"<script[^>]*>.*?</script>", re.DOTALL)
+_STYLE_RE = re.compile(r"<style[^>]*>.*?</style>", re.DOTALL)
+
 
 @pytest.mark.integration
 @pytest.mark.timeout(120)
@@ -32,8 +35,10 @@ def test_e2e_pipeline(tmp_path):
     claims = claims_data["claims"]
     assert 20 <= len(claims) <= 60, f"Unexpected claim count: {len(claims)}"
 
-    statistics_set = {c["statistic"] for c in claims}
-    found = [stat for stat in REQUIRED_STATISTICS if any(stat in s for s in statistics_set)]
+    # Newline-joined so one substring search per required statistic covers
+    # every claim without matching across two statistics.
+    all_statistics_text = "\n".join({c["statistic"] for c in claims})
+    found = [stat for stat in REQUIRED_STATISTICS if stat in all_statistics_text]
     coverage = len(found) / len(REQUIRED_STATISTICS)
     assert coverage >= 0.80, (
         f"Only {len(found)}/{len(REQUIRED_STATISTICS)} required statistics found ({coverage:.0%}). "
@@ -58,8 +63,8 @@ def test_e2e_pipeline(tmp_path):
     claim_statistics = [c["statistic"] for c in claims]
     for vf in variant_files:
         html = vf.read_text()
-        visible = re.sub(r"<script[^>]*>.*?</script>", "", html, flags=re.DOTALL)
-        visible = re.sub(r"<style[^>]*>.*?</style>", "", visible, flags=re.DOTALL)
+        visible = _SCRIPT_RE.sub("", html)
+        visible = _STYLE_RE.sub("", visible)
         for stat in claim_statistics:
             assert stat in visible, (
                 f"{vf.name} missing statistic {stat!r} in visible HTML"
@@ -164,6 +164,53 @@ def test_run_pipeline_handles_batch_exceptions(
     assert len(report_data["results"]) == 3
 
 
+@patch("pipeline.orchestrator.validate_variant")
+@patch("pipeline.orchestrator.generate_all_variants")
+@patch("pipeline.orchestrator.extract_claims")
+def test_run_pipeline_isolates_validation_failure(
+    mock_extract, mock_generate, mock_validate, tmp_path
+):
+    from pipeline.generate import VARIANT_TYPES
+    from pipeline.orchestrator import run_pipeline
+
+    def _validate(variant_type, html, extraction):
+        if variant_type == VARIANT_TYPES[2]:
+            raise RuntimeError("checker crashed")
+        return _make_variant_result(variant_type, html)
+
+    mock_extract.return_value = _make_extraction(20)
+    mock_generate.return_value = [f"<html>{vt}</html>" for vt in VARIANT_TYPES]
+    mock_validate.side_effect = _validate
+
+    results = run_pipeline(page_content="test content", output_dir=tmp_path)
+
+    assert [r.variant_type for r in results] == [vt for vt in VARIANT_TYPES if vt != VARIANT_TYPES[2]]
+    assert not (tmp_path / "variant_2.html").exists()
+    assert (tmp_path / "variant_3.html").exists()
+
+
+@patch("pipeline.orchestrator.validate_variant")
+@patch("pipeline.orchestrator.generate_all_variants")
+@patch("pipeline.orchestrator.extract_claims")
+def test_run_pipeline_write_failure_recorded_once(
+    mock_extract, mock_generate, mock_validate, tmp_path
+):
+    from pipeline.generate import VARIANT_TYPES
+    from pipeline.orchestrator import run_pipeline
+
+    mock_extract.return_value = _make_extraction(20)
+    mock_generate.return_value = [f"<html>{vt}</html>" for vt in VARIANT_TYPES]
+    mock_validate.side_effect = [_make_variant_result(vt, f"<html>{vt}</html>") for vt in VARIANT_TYPES]
+    # A directory in the way makes the variant's HTML write fail after validation.
+    (tmp_path / "variant_1.html").mkdir()
+
+    results = run_pipeline(page_content="test content", output_dir=tmp_path)
+
+    assert VARIANT_TYPES[1] not in [r.variant_type for r in results]
+    index_html = (tmp_path / "index.html").read_text(encoding="utf-8")
+    assert '<span class="stat-num">1</span> Failed' in index_html
+
+
 @patch("pipeline.orchestrator.validate_variant")
 @patch("pipeline.orchestrator.generate_all_variants")
 @patch("pipeline.orchestrator.extract_claims")
@@ -1,3 +1,5 @@
+import pytest
+
 from pipeline.compliance import (
     check_numbers, check_citations, check_unexpected_numbers,
     check_qualifiers, check_endpoints, run_programmatic_compliance,
@@ -67,6 +69,26 @@ class TestCheckUnexpectedNumbers:
         flags = check_unexpected_numbers(html, sample_extraction_result.claims)
         assert not flags
 
+    def test_strips_script_with_angle_brackets_in_body(self, sample_extraction_result):
+        html = "<script>if (a < b) { x = 45.0%; }</script><p>36.2% and 23.0%</p>"
+        flags = check_unexpected_numbers(html, sample_extraction_result.claims)
+        assert not flags
+
+    def test_script_containing_style_close_tag_fully_stripped(self, sample_extraction_result):
+        html = '<SCRIPT>var s = "</style>"; var x = 45.0%;</script><p>36.2% and 23.0%</p>'
+        flags = check_unexpected_numbers(html, sample_extraction_result.claims)
+        assert not flags
+
+    def test_unterminated_script_keeps_following_text(self, sample_extraction_result):
+        html = "<script>var x = 45.0%;<p>36.2% and 23.0%</p>"
+        flags = check_unexpected_numbers(html, sample_extraction_result.claims)
+        assert any(f.location == "45.0%" for f in flags)
+
+    @pytest.mark.timeout(5)
+    def test_many_unterminated_openers_scan_linearly(self, sample_extraction_result):
+        html = "<script>" * 100_000 + "<p>36.2% and 23.0%</p>"
+        assert not check_unexpected_numbers(html, sample_extraction_result.claims)
+
 
 class TestCheckQualifiers:
 
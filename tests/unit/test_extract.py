@@ -45,10 +45,14 @@ def test_extract_claims_uses_correct_model_config():
     import pipeline.extract
     pipeline.extract._extraction_chain = None
 
-    with patch("pipeline.extract.ChatOpenAI", mock_chat_openai):
+    with patch("langchain_openai.ChatOpenAI", mock_chat_openai):
         pipeline.extract._get_chain()
 
-    mock_chat_openai.assert_called_once_with(model="gpt-5-nano")
+    mock_chat_openai.assert_called_once_with(
+        model="gpt-5-nano",
+        max_tokens=pipeline.extract.EXTRACTION_MAX_TOKENS,
+        model_kwargs={"prompt_cache_key": pipeline.extract.PROMPT_CACHE_KEY},
+    )
     pipeline.extract._extraction_chain = None
 
 
@@ -60,8 +64,146 @@ def test_extraction_chain_uses_structured_output():
     import pipeline.extract
     pipeline.extract._extraction_chain = None
 
-    with patch("pipeline.extract.ChatOpenAI", mock_chat_openai):
+    with patch("langchain_openai.ChatOpenAI", mock_chat_openai):
         pipeline.extract._get_chain()
 
     mock_llm.with_structured_output.assert_called_once_with(ExtractionResult)
     pipeline.extract._extraction_chain = None
+
+
+def test_extraction_prompt_keeps_static_prefix_first():
+    mock_llm = MagicMock()
+    mock_llm.with_structured_output.return_value = MagicMock()
+    mock_chat_openai = MagicMock(return_value=mock_llm)
+
+    import pipeline.extract
+    pipeline.extract._extraction_chain = None
+
+    with patch("langchain_openai.ChatOpenAI", mock_chat_openai):
+        chain = pipeline.extract._get_chain()
+
+    # Provider prompt caching only hits when the system prompt is a
+    # byte-identical prefix and the per-document text comes last.
+    first = chain.first.format_messages(source_text="document A")
+    second = chain.first.format_messages(source_text="document B")
+    assert first[0].content == second[0].content == pipeline.extract.EXTRACTION_SYSTEM_PROMPT
+    assert [m.content for m in first[1:]] == ["document A"]
+    pipeline.extract._extraction_chain = None
+
+
+def test_get_chain_builds_once_under_concurrent_first_use():
+    from concurrent.futures import ThreadPoolExecutor
+
+    mock_llm = MagicMock()
+    mock_llm.with_structured_output.return_value = MagicMock()
+    mock_chat_openai = MagicMock(return_value=mock_llm)
+
+    import pipeline.extract
+    pipeline.extract._extraction_chain = None
+
+    with patch("langchain_openai.ChatOpenAI", mock_chat_openai):
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            chains = list(pool.map(lambda _: pipeline.extract._get_chain(), range(8)))
+
+    mock_chat_openai.assert_called_once()
+    assert all(chain is chains[0] for chain in chains)
+    pipeline.extract._extraction_chain = None
+
+
+def test_extract_claims_uses_disk_cache(sample_extraction_result, tmp_path, monkeypatch):
+    monkeypatch.setenv("EXTRACTION_CACHE_DIR", str(tmp_path))
+    mock_chain = MagicMock()
+    mock_chain.invoke.return_value = sample_extraction_result
+
+    with patch("pipeline.extract._get_chain", return_value=mock_chain):
+        from pipeline.extract import extract_claims
+        first = extract_claims("cached source text")
+        second = extract_claims("cached source text")
+
+    mock_chain.invoke.assert_called_once()
+    assert len(list(tmp_path.glob("*.json"))) == 1
+    assert second == first == sample_extraction_result
+
+
+def test_extract_claims_cache_disabled_by_default(tmp_path, monkeypatch):
+    monkeypatch.delenv("EXTRACTION_CACHE_DIR", raising=False)
+    mock_chain = MagicMock()
+    mock_chain.invoke.return_value = ExtractionResult(claims=[])
+
+    with patch("pipeline.extract._get_chain", return_value=mock_chain):
+        from pipeline.extract import extract_claims
+        extract_claims("uncached text")
+        extract_claims("uncached text")
+
+    assert mock_chain.invoke.call_count == 2
+
+
+def test_extract_cache_key_includes_model(tmp_path, monkeypatch):
+    import pipeline.extract
+    monkeypatch.setenv("EXTRACTION_CACHE_DIR", str(tmp_path))
+
+    before = pipeline.extract._cache_path("same text")
+    monkeypatch.setattr(pipeline.extract, "EXTRACTION_MODEL", "another-model")
+    after = pipeline.extract._cache_path("same text")
+
+    assert before != after
+
+
+def test_extract_cache_key_includes_prompt(tmp_path, monkeypatch):
+    import pipeline.extract
+    monkeypatch.setenv("EXTRACTION_CACHE_DIR", str(tmp_path))
+
+    before = pipeline.extract._cache_path("same text")
+    monkeypatch.setattr(pipeline.extract, "EXTRACTION_SYSTEM_PROMPT", "edited prompt")
+    after = pipeline.extract._cache_path("same text")
+
+    assert before != after
+
+
+def test_extract_claims_treats_corrupt_cache_as_miss(sample_extraction_result, tmp_path, monkeypatch):
+    import pipeline.extract
+    monkeypatch.setenv("EXTRACTION_CACHE_DIR", str(tmp_path))
+    cache_path = pipeline.extract._cache_path("cached source text")
+    cache_path.write_text('{"claims": [', encoding="utf-8")
+    mock_chain = MagicMock()
+    mock_chain.invoke.return_value = sample_extraction_result
+
+    with patch("pipeline.extract._get_chain", return_value=mock_chain):
+        result = pipeline.extract.extract_claims("cached source text")
+
+    mock_chain.invoke.assert_called_once()
+    assert result == sample_extraction_result
+    assert ExtractionResult.model_validate_json(cache_path.read_text(encoding="utf-8")) == result
+    assert list(tmp_path.iterdir()) == [cache_path]
+
+
+def test_extract_claims_unusable_cache_dir_is_a_miss(sample_extraction_result, tmp_path, monkeypatch):
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_text("", encoding="utf-8")
+    monkeypatch.setenv("EXTRACTION_CACHE_DIR", str(blocker / "cache"))
+    mock_chain = MagicMock()
+    mock_chain.invoke.return_value = sample_extraction_result
+
+    with patch("pipeline.extract._get_chain", return_value=mock_chain):
+        from pipeline.extract import extract_claims
+        result = extract_claims("cached source text")
+
+    mock_chain.invoke.assert_called_once()
+    assert result == sample_extraction_result
+
+
+def test_extract_claims_returns_result_when_cache_write_fails(
+    sample_extraction_result, tmp_path, monkeypatch, caplog
+):
+    monkeypatch.setenv("EXTRACTION_CACHE_DIR", str(tmp_path))
+    mock_chain = MagicMock()
+    mock_chain.invoke.return_value = sample_extraction_result
+
+    with patch("pipeline.extract._get_chain", return_value=mock_chain), \
+            patch("pipeline.extract.os.replace", side_effect=PermissionError("read-only")):
+        from pipeline.extract import extract_claims
+        result = extract_claims("cached source text")
+
+    assert result == sample_extraction_result
+    assert "Could not write extraction cache" in caplog.text
+    assert list(tmp_path.iterdir()) == []
@@ -81,3 +81,36 @@ def test_extract_handles_none_text(mock_reader_cls):
     mock_reader_cls.return_value = reader
     result = extract_pdf_text(Path("dummy.pdf"))
     assert result == ""
+
+
+class _InlineExecutor:
+    """Stand-in for ProcessPoolExecutor that runs in-process so PdfReader stays patched."""
+
+    def __init__(self, max_workers):
+        self.max_workers = max_workers
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def map(self, fn, *iterables):
+        return map(fn, *iterables)
+
+
+@patch("pipeline.ingest.ProcessPoolExecutor", _InlineExecutor)
+@patch("pipeline.ingest.PdfReader")
+def test_extract_with_workers_preserves_page_order(mock_reader_cls):
+    texts = [f"page {n}" for n in range(1, 6)]
+    mock_reader_cls.return_value = _mock_reader(texts)
+    result = extract_pdf_text(Path("dummy.pdf"), workers=2)
+    assert result == "\n\n".join(texts)
+
+
+@patch("pipeline.ingest.ProcessPoolExecutor")
+@patch("pipeline.ingest.PdfReader")
+def test_extract_single_worker_stays_in_process(mock_reader_cls, mock_executor):
+    mock_reader_cls.return_value = _mock_reader(["page one", "page two"])
+    extract_pdf_text(Path("dummy.pdf"))
+    mock_executor.assert_not_called()
@@ -1,9 +1,25 @@
 """Unit tests for pipeline/templates.py shared helpers and HTML skeleton."""
 
 import json
+import re
 
 import pytest
 from pipeline.schemas import ClinicalClaim
+from pipeline.templates import (
+    _build_data_table,
+    _collect_qualifiers,
+    _html_skeleton,
+    _index_by,
+    _parse_all,
+    _parse_stat,
+    _sort_timepoint_key,
+    _unique_values,
+    render_grouped_bar,
+    render_heatmap,
+    render_infographic,
+    render_spotlight_cards,
+    render_timeline,
+)
 
 
 @pytest.fixture
@@ -63,65 +79,69 @@ def fabricated_claims():
 
 class TestUniqueValues:
     def test_deduplicates(self, sample_claims):
-        from pipeline.templates import _unique_values
         result = _unique_values(sample_claims, "timepoint")
         assert result == ["Week 24"]
 
     def test_preserves_insertion_order(self, sample_claims):
-        from pipeline.templates import _unique_values
         result = _unique_values(sample_claims, "context")
         assert result == ["Non-AT/Non-AU patients", "AT patients"]
 
     def test_multiple_distinct_values(self, fabricated_claims):
-        from pipeline.templates import _unique_values
         result = _unique_values(fabricated_claims, "context")
         assert result == ["Mild severity", "Moderate severity"]
 
 
+# --- _index_by ---
+
+class TestIndexBy:
+    def test_keys_match_unique_values(self, fabricated_claims):
+        result = _index_by(fabricated_claims, "context")
+        assert list(result) == _unique_values(fabricated_claims, "context")
+
+    def test_groups_preserve_claim_order(self, fabricated_claims):
+        result = _index_by(fabricated_claims, "context")
+        for ctx, group in result.items():
+            assert group == [c for c in fabricated_claims if c.context == ctx]
+
+
 # --- _parse_stat ---
 
 class TestParseStat:
     def test_percentage(self):
-        from pipeline.templates import _parse_stat
         assert _parse_stat("36.2%") == 36.2
 
     def test_plain_number(self):
-        from pipeline.templates import _parse_stat
         assert _parse_stat("42") == 42.0
 
     def test_decimal_without_percent(self):
-        from pipeline.templates import _parse_stat
         assert _parse_stat("3.5") == 3.5
 
     def test_not_reported_returns_none(self):
-        from pipeline.templates import _parse_stat
         assert _parse_stat("not reported") is None
 
     def test_na_returns_none(self):
-        from pipeline.templates import _parse_stat
         assert _parse_stat("N/A") is None
 
     def test_negative_number(self):
-        from pipeline.templates import _parse_stat
         assert _parse_stat("-2.5%") == -2.5
 
+    def test_parse_all_matches_claim_order(self, sample_claims):
+        assert _parse_all(sample_claims) == [_parse_stat(c.statistic) for c in sample_claims]
+
 
 # --- _collect_qualifiers ---
 
 class TestCollectQualifiers:
     def test_returns_unique_qualifiers(self, sample_claims):
-        from pipeline.templates import _collect_qualifiers
         result = _collect_qualifiers(sample_claims)
         assert set(result) == {"Post hoc analysis", "Subgroup analysis"}
 
     def test_deduplicates(self, fabricated_claims):
-        from pipeline.templates import _collect_qualifiers
         result = _collect_qualifiers(fabricated_claims)
         assert "ITT population" in result
         assert result.count("ITT population") == 1
 
     def test_preserves_insertion_order(self, fabricated_claims):
-        from pipeline.templates import _collect_qualifiers
         result = _collect_qualifiers(fabricated_claims)
         assert result[0] == "ITT population"
 
@@ -130,55 +150,45 @@ class TestCollectQualifiers:
 
 class TestHtmlSkeleton:
     def test_returns_complete_html(self):
-        from pipeline.templates import _html_skeleton
         result = _html_skeleton("Test Title", "<p>hello</p>", "")
         assert "<!DOCTYPE html>" in result
         assert "</html>" in result
         assert "<p>hello</p>" in result
 
     def test_includes_chart_js_cdn(self):
-        from pipeline.templates import _html_skeleton
         result = _html_skeleton("Test", "<p>x</p>", "")
         assert "chart.js" in result.lower() or "Chart.js" in result or "cdn" in result.lower()
 
     def test_includes_viewport_meta(self):
-        from pipeline.templates import _html_skeleton
         result = _html_skeleton("Test", "<p>x</p>", "")
         assert "viewport" in result
 
     def test_includes_css_custom_properties(self):
-        from pipeline.templates import _html_skeleton
         result = _html_skeleton("Test", "<p>x</p>", "")
         assert "--" in result  # CSS custom properties use -- prefix
 
     def test_title_in_output(self):
-        from pipeline.templates import _html_skeleton
         result = _html_skeleton("My Report", "<p>x</p>", "")
         assert "My Report" in result
 
     def test_max_width_centered(self):
-        from pipeline.templates import _html_skeleton
         result = _html_skeleton("Test", "<p>x</p>", "")
         assert "1200px" in result or "1200" in result
 
     def test_includes_inter_font(self):
-        from pipeline.templates import _html_skeleton
         result = _html_skeleton("Test", "<p>x</p>", "")
         assert "Inter" in result
 
     def test_no_external_stylesheets(self):
-        from pipeline.templates import _html_skeleton
         result = _html_skeleton("Test", "<p>x</p>", "")
         # Should not have <link rel="stylesheet"> (except CDN fonts)
         assert 'rel="stylesheet"' not in result or "fonts.googleapis" in result
 
     def test_includes_print_rules(self):
-        from pipeline.templates import _html_skeleton
         result = _html_skeleton("Test", "<p>x</p>", "")
         assert "@media print" in result
 
     def test_script_appended(self):
-        from pipeline.templates import _html_skeleton
         result = _html_skeleton("Test", "<p>x</p>", "<script>alert(1)</script>")
         assert "<script>alert(1)</script>" in result
 
@@ -221,24 +231,21 @@ def multi_endpoint_claims():
     ]
 
 
+_SCRIPT_RE = re.compile(r"<script[^>]*>.*?</script>", re.DOTALL)
+
+
 def _unique_contexts(claims):
-    seen = {}
-    for c in claims:
-        if c.context not in seen:
-            seen[c.context] = True
-    return list(seen)
+    return list(dict.fromkeys(c.context for c in claims))
 
 
 def _strip_scripts(html: str) -> str:
-    import re
-    return re.sub(r"<script[^>]*>.*?</script>", "", html, flags=re.DOTALL)
+    return _SCRIPT_RE.sub("", html)
 
 
 # --- render_grouped_bar ---
 
 class TestRenderGroupedBar:
     def test_returns_valid_html(self, sample_claims):
-        from pipeline.templates import render_grouped_bar
         result = render_grouped_bar(sample_claims)
         assert isinstance(result, str)
         assert len(result) > 0
@@ -246,55 +253,46 @@ class TestRenderGroupedBar:
         assert "</html>" in result
 
     def test_statistics_in_visible_html(self, sample_claims):
-        from pipeline.templates import render_grouped_bar
         result = render_grouped_bar(sample_claims)
         visible = _strip_scripts(result)
         for claim in sample_claims:
             assert claim.statistic in visible
 
     def test_citations_present(self, sample_claims):
-        from pipeline.templates import render_grouped_bar
         result = render_grouped_bar(sample_claims)
         for claim in sample_claims:
             assert claim.citation in result
 
     def test_qualifiers_present(self, sample_claims):
-        from pipeline.templates import render_grouped_bar
         result = render_grouped_bar(sample_claims)
         for claim in sample_claims:
             for q in claim.qualifiers:
                 assert q in result
 
     def test_endpoints_present(self, sample_claims):
-        from pipeline.templates import render_grouped_bar
         result = render_grouped_bar(sample_claims)
         for claim in sample_claims:
             assert claim.endpoint in result
 
     def test_works_with_sample_claims(self, sample_claims):
-        from pipeline.templates import render_grouped_bar
         result = render_grouped_bar(sample_claims)
         assert "<!DOCTYPE html>" in result
 
     def test_single_timepoint_no_crash(self, sample_claims):
-        from pipeline.templates import render_grouped_bar
         result = render_grouped_bar(sample_claims[:1])
         assert "<!DOCTYPE html>" in result
 
     def test_multiple_endpoints(self, multi_endpoint_claims):
-        from pipeline.templates import render_grouped_bar
         result = render_grouped_bar(multi_endpoint_claims)
         assert "Primary Endpoint" in result
         assert "Secondary Endpoint" in result
 
     def test_deterministic_output(self, sample_claims):
-        from pipeline.templates import render_grouped_bar
         a = render_grouped_bar(sample_claims)
         b = render_grouped_bar(sample_claims)
         assert a == b
 
     def test_no_hardcoded_values(self, fabricated_claims):
-        from pipeline.templates import render_grouped_bar
         result = render_grouped_bar(fabricated_claims)
         visible = _strip_scripts(result)
         for claim in fabricated_claims:
@@ -309,7 +307,6 @@ class TestRenderGroupedBar:
 
 class TestRenderTimeline:
     def test_returns_valid_html(self, sample_claims):
-        from pipeline.templates import render_timeline
         result = render_timeline(sample_claims)
         assert isinstance(result, str)
         assert len(result) > 0
@@ -317,39 +314,33 @@ class TestRenderTimeline:
         assert "</html>" in result
 
     def test_statistics_in_visible_html(self, sample_claims):
-        from pipeline.templates import render_timeline
         result = render_timeline(sample_claims)
         visible = _strip_scripts(result)
         for claim in sample_claims:
             assert claim.statistic in visible
 
     def test_citations_present(self, sample_claims):
-        from pipeline.templates import render_timeline
         result = render_timeline(sample_claims)
         for claim in sample_claims:
             assert claim.citation in result
 
     def test_qualifiers_present(self, sample_claims):
-        from pipeline.templates import render_timeline
         result = render_timeline(sample_claims)
         for claim in sample_claims:
             for q in claim.qualifiers:
                 assert q in result
 
     def test_endpoints_present(self, sample_claims):
-        from pipeline.templates import render_timeline
         result = render_timeline(sample_claims)
         for claim in sample_claims:
             assert claim.endpoint in result
 
     def test_deterministic_output(self, sample_claims):
-        from pipeline.templates import render_timeline
         a = render_timeline(sample_claims)
         b = render_timeline(sample_claims)
         assert a == b
 
     def test_no_hardcoded_values(self, fabricated_claims):
-        from pipeline.templates import render_timeline
         result = render_timeline(fabricated_claims)
         visible = _strip_scripts(result)
         for claim in fabricated_claims:
@@ -360,12 +351,10 @@ class TestRenderTimeline:
                 assert q in result
 
     def test_single_timepoint_renders_bar(self, sample_claims):
-        from pipeline.templates import render_timeline
         result = render_timeline(sample_claims[:1])
         assert "'bar'" in result or '"bar"' in result
 
     def test_multi_timepoint_renders_line(self, multi_timepoint_claims):
-        from pipeline.templates import render_timeline
         result = render_timeline(multi_timepoint_claims)
         assert "'line'" in result or '"line"' in result
 
@@ -374,33 +363,28 @@ class TestRenderTimeline:
 
 class TestRenderSpotlightCards:
     def test_statistics_in_visible_html(self, sample_claims):
-        from pipeline.templates import render_spotlight_cards
         result = render_spotlight_cards(sample_claims)
         visible = _strip_scripts(result)
         for claim in sample_claims:
             assert claim.statistic in visible
 
     def test_citations_present(self, sample_claims):
-        from pipeline.templates import render_spotlight_cards
         result = render_spotlight_cards(sample_claims)
         for claim in sample_claims:
             assert claim.citation in result
 
     def test_qualifiers_present(self, sample_claims):
-        from pipeline.templates import render_spotlight_cards
         result = render_spotlight_cards(sample_claims)
         for claim in sample_claims:
             for q in claim.qualifiers:
                 assert q in result
 
     def test_endpoints_present(self, sample_claims):
-        from pipeline.templates import render_spotlight_cards
         result = render_spotlight_cards(sample_claims)
         for claim in sample_claims:
             assert claim.endpoint in result
 
     def test_works_with_fabricated_claims(self, fabricated_claims):
-        from pipeline.templates import render_spotlight_cards
         result = render_spotlight_cards(fabricated_claims)
         visible = _strip_scripts(result)
         for claim in fabricated_claims:
@@ -411,19 +395,16 @@ class TestRenderSpotlightCards:
                 assert q in result
 
     def test_deterministic_output(self, sample_claims):
-        from pipeline.templates import render_spotlight_cards
         a = render_spotlight_cards(sample_claims)
         b = render_spotlight_cards(sample_claims)
         assert a == b
 
     def test_one_card_per_context(self, sample_claims):
-        from pipeline.templates import render_spotlight_cards
         result = render_spotlight_cards(sample_claims)
         contexts = _unique_contexts(sample_claims)
         assert result.count('class="spotlight-card"') == len(contexts)
 
     def test_no_chart_js(self, sample_claims):
-        from pipeline.templates import render_spotlight_cards
         result = render_spotlight_cards(sample_claims)
         assert "cdn.jsdelivr.net/npm/chart.js" not in result
 
@@ -432,33 +413,28 @@ class TestRenderSpotlightCards:
 
 class TestRenderHeatmap:
     def test_statistics_in_visible_html(self, sample_claims):
-        from pipeline.templates import render_heatmap
         result = render_heatmap(sample_claims)
         visible = _strip_scripts(result)
         for claim in sample_claims:
             assert claim.statistic in visible
 
     def test_citations_present(self, sample_claims):
-        from pipeline.templates import render_heatmap
         result = render_heatmap(sample_claims)
         for claim in sample_claims:
             assert claim.citation in result
 
     def test_qualifiers_present(self, sample_claims):
-        from pipeline.templates import render_heatmap
         result = render_heatmap(sample_claims)
         for claim in sample_claims:
             for q in claim.qualifiers:
                 assert q in result
 
     def test_endpoints_present(self, sample_claims):
-        from pipeline.templates import render_heatmap
         result = render_heatmap(sample_claims)
         for claim in sample_claims:
             assert claim.endpoint in result
 
     def test_works_with_fabricated_claims(self, fabricated_claims):
-        from pipeline.templates import render_heatmap
         result = render_heatmap(fabricated_claims)
         visible = _strip_scripts(result)
         for claim in fabricated_claims:
@@ -469,18 +445,15 @@ class TestRenderHeatmap:
                 assert q in result
 
     def test_deterministic_output(self, sample_claims):
-        from pipeline.templates import render_heatmap
         a = render_heatmap(sample_claims)
         b = render_heatmap(sample_claims)
         assert a == b
 
     def test_no_chart_js(self, sample_claims):
-        from pipeline.templates import render_heatmap
         result = render_heatmap(sample_claims)
         assert "cdn.jsdelivr.net/npm/chart.js" not in result
 
     def test_cell_colors_from_data(self, sample_claims):
-        from pipeline.templates import render_heatmap
         result = render_heatmap(sample_claims)
         assert "background-color" in result
 
@@ -489,33 +462,28 @@ class TestRenderHeatmap:
 
 class TestRenderInfographic:
     def test_statistics_in_visible_html(self, sample_claims):
-        from pipeline.templates import render_infographic
         result = render_infographic(sample_claims)
         visible = _strip_scripts(result)
         for claim in sample_claims:
             assert claim.statistic in visible
 
     def test_citations_present(self, sample_claims):
-        from pipeline.templates import render_infographic
         result = render_infographic(sample_claims)
         for claim in sample_claims:
             assert claim.citation in result
 
     def test_qualifiers_present(self, sample_claims):
-        from pipeline.templates import render_infographic
         result = render_infographic(sample_claims)
         for claim in sample_claims:
             for q in claim.qualifiers:
                 assert q in result
 
     def test_endpoints_present(self, sample_claims):
-        from pipeline.templates import render_infographic
         result = render_infographic(sample_claims)
         for claim in sample_claims:
             assert claim.endpoint in result
 
     def test_works_with_fabricated_claims(self, fabricated_claims):
-        from pipeline.templates import render_infographic
         result = render_infographic(fabricated_claims)
         visible = _strip_scripts(result)
         for claim in fabricated_claims:
@@ -526,18 +494,15 @@ class TestRenderInfographic:
                 assert q in result
 
     def test_deterministic_output(self, sample_claims):
-        from pipeline.templates import render_infographic
         a = render_infographic(sample_claims)
         b = render_infographic(sample_claims)
         assert a == b
 
     def test_hero_section_present(self, sample_claims):
-        from pipeline.templates import render_infographic
         result = render_infographic(sample_claims)
         assert 'class="hero"' in result
 
     def test_chart_js_present(self, sample_claims):
-        from pipeline.templates import render_infographic
         result = render_infographic(sample_claims)
         assert "cdn.jsdelivr.net/npm/chart.js" in result
 
@@ -558,19 +523,15 @@ def _maybe_escaped(val: str) -> tuple[str, str]:
 
 class TestSortTimepointKey:
     def test_week_ordering(self):
-        from pipeline.templates import _sort_timepoint_key
         assert _sort_timepoint_key("Week 12") < _sort_timepoint_key("Week 24")
 
     def test_day_before_week(self):
-        from pipeline.templates import _sort_timepoint_key
         assert _sort_timepoint_key("Day 7") < _sort_timepoint_key("Week 1")
 
     def test_month_before_year(self):
-        from pipeline.templates import _sort_timepoint_key
         assert _sort_timepoint_key("Month 6") < _sort_timepoint_key("Year 1")
 
     def test_unrecognized_falls_back(self):
-        from pipeline.templates import _sort_timepoint_key
         # Unrecognized strings get (1, 0.0) — sorts after any recognized timepoint
         assert _sort_timepoint_key("Baseline") > _sort_timepoint_key("Week 1")
 
@@ -579,22 +540,18 @@ class TestSortTimepointKey:
 
 class TestHtmlSkeletonParams:
     def test_exclude_chart_js(self):
-        from pipeline.templates import _html_skeleton
         result = _html_skeleton("T", "<p>x</p>", "", include_chart_js=False)
         assert "cdn.jsdelivr.net/npm/chart.js" not in result
 
     def test_include_chart_js_default(self):
-        from pipeline.templates import _html_skeleton
         result = _html_skeleton("T", "<p>x</p>", "")
         assert "cdn.jsdelivr.net/npm/chart.js" in result
 
     def test_extra_css_injected(self):
-        from pipeline.templates import _html_skeleton
         result = _html_skeleton("T", "<p>x</p>", "", extra_css=".custom { color: red; }")
         assert ".custom { color: red; }" in result
 
     def test_extra_css_empty_by_default(self):
-        from pipeline.templates import _html_skeleton
         result = _html_skeleton("T", "<p>x</p>", "")
         # No extra_css means no additional style block beyond the base
         assert result.count("<style>") == 1
@@ -604,7 +561,6 @@ class TestHtmlSkeletonParams:
 
 class TestBuildDataTable:
     def test_contains_all_fields(self, sample_claims):
-        from pipeline.templates import _build_data_table
         result = _build_data_table(sample_claims)
         for c in sample_claims:
             assert any(v in result for v in _maybe_escaped(c.treatment_arm))
@@ -613,16 +569,15 @@ class TestBuildDataTable:
             assert any(v in result for v in _maybe_escaped(c.sample_size))
 
     def test_table_structure(self, sample_claims):
-        from pipeline.templates import _build_data_table
         result = _build_data_table(sample_claims)
         assert "<table>" in result
         assert "<thead>" in result
-        assert "<tbody>" in result
-        # +1 for the header row in <thead>
-        assert result.count("<tr>") == len(sample_claims) + 1
+        head = result[result.index("<thead>"):result.index("</thead>")]
+        assert head.count("<tr>") == 1
+        body = result[result.index("<tbody>"):result.index("</tbody>")]
+        assert body.count("<tr>") == len(sample_claims)
 
     def test_single_claim(self, sample_claims):
-        from pipeline.templates import _build_data_table
         result = _build_data_table(sample_claims[:1])
         assert "<tr>" in result
 
@@ -631,27 +586,22 @@ class TestBuildDataTable:
 
 class TestEmptyClaims:
     def test_grouped_bar_empty(self):
-        from pipeline.templates import render_grouped_bar
         result = render_grouped_bar([])
         assert "<!DOCTYPE html>" in result
 
     def test_timeline_empty(self):
-        from pipeline.templates import render_timeline
         result = render_timeline([])
         assert "<!DOCTYPE html>" in result
 
     def test_spotlight_cards_empty(self):
-        from pipeline.templates import render_spotlight_cards
         result = render_spotlight_cards([])
         assert "<!DOCTYPE html>" in result
 
     def test_heatmap_empty(self):
-        from pipeline.templates import render_heatmap
         result = render_heatmap([])
         assert "<!DOCTYPE html>" in result
 
     def test_infographic_empty(self):
-        from pipeline.templates import render_infographic
         result = render_infographic([])
         assert "<!DOCTYPE html>" in result
 
@@ -660,19 +610,16 @@ class TestEmptyClaims:
 
 class TestPhase3ValidHtml:
     def test_spotlight_cards_valid_html(self, sample_claims):
-        from pipeline.templates import render_spotlight_cards
         result = render_spotlight_cards(sample_claims)
         assert "<!DOCTYPE html>" in result
         assert "</html>" in result
 
     def test_heatmap_valid_html(self, sample_claims):
-        from pipeline.templates import render_heatmap
         result = render_heatmap(sample_claims)
         assert "<!DOCTYPE html>" in result
         assert "</html>" in result
 
     def test_infographic_valid_html(self, sample_claims):
-        from pipeline.templates import render_infographic
         result = render_infographic(sample_claims)
         assert "<!DOCTYPE html>" in result
         assert "</html>" in result
@@ -682,7 +629,6 @@ class TestPhase3ValidHtml:
 
 class TestHtmlEscaping:
     def test_xss_in_treatment_arm(self):
-        from pipeline.templates import render_grouped_bar
         evil_claim = ClinicalClaim(
             statistic="50%", context="All", timepoint="Week 1",
             treatment_arm='<script>alert("xss")</script>',
@@ -694,7 +640,6 @@ class TestHtmlEscaping:
         assert "&lt;script&gt;" in result
 
     def test_single_quote_in_endpoint_js(self):
-        from pipeline.templates import render_grouped_bar
         claim = ClinicalClaim(
             statistic="50%", context="All", timepoint="Week 1",
             treatment_arm="Drug A (n=100)", sample_size="n=100",
@@ -710,7 +655,6 @@ class TestHtmlEscaping:
 
 class TestNonParseableStat:
     def test_not_reported_in_grouped_bar(self):
-        from pipeline.templates import render_grouped_bar
         claim = ClinicalClaim(
             statistic="not reported", context="All", timepoint="Week 1",
             treatment_arm="Drug A (n=100)", sample_size="n=100",
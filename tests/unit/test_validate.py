@@ -2,6 +2,8 @@
 
 from unittest.mock import patch
 
+import pytest
+
 from pipeline.schemas import ComplianceFlag, ComplianceReport, VariantResult
 from pipeline.validate import validate_variant
 
@@ -21,19 +23,19 @@ def _failing_report() -> ComplianceReport:
     ])
 
 
-def test_programmatic_pass_overall_passed_true(sample_extraction_result):
-    with patch("pipeline.validate.run_programmatic_compliance", return_value=_make_report(True)):
+@pytest.mark.parametrize(
+    ("report", "expected"),
+    [
+        pytest.param(_make_report(True), True, id="programmatic_pass"),
+        pytest.param(_failing_report(), False, id="programmatic_fail"),
+    ],
+)
+def test_overall_passed_follows_programmatic(report, expected, sample_extraction_result):
+    with patch("pipeline.validate.run_programmatic_compliance", return_value=report):
         result = validate_variant("grouped_bar", "<html></html>", sample_extraction_result)
 
     assert isinstance(result, VariantResult)
-    assert result.overall_passed is True
-
-
-def test_programmatic_fails_overall_false(sample_extraction_result):
-    with patch("pipeline.validate.run_programmatic_compliance", return_value=_failing_report()):
-        result = validate_variant("grouped_bar", "<html></html>", sample_extraction_result)
-
-    assert result.overall_passed is False
+    assert result.overall_passed is expected
 
 
 def test_passes_correct_args(sample_extraction_result):